@@ -1,2 +1,9 @@
-from cognix.editor.main.cognix_editor import run as run_editor
-from cognix.editor.main.cognix_console import run as run_console
\ No newline at end of file
+def __getattr__(name: str):
+    # imported on first access, so e.g. the console doesn't load the editor
+    if name == 'run_editor':
+        from cognix.editor.main.cognix_editor import run
+        return run
+    if name == 'run_console':
+        from cognix.editor.main.cognix_console import run
+        return run
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
@@ -1,7 +1,14 @@
 # from ryven.node_env import *
 # from ryven.gui_env import *
 
-from .main import utils as utils
 
-# expose loading nodes package functionality for manual deployment
-from .main.packages.nodes_package import NodesPackage, import_nodes_package
+def __getattr__(name: str):
+    # imported on first access, so importing the editor doesn't load the node environment
+    if name == 'utils':
+        from .main import utils
+        return utils
+    # expose loading nodes package functionality for manual deployment
+    if name in ('NodesPackage', 'import_nodes_package'):
+        from .main.packages import nodes_package
+        return getattr(nodes_package, name)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
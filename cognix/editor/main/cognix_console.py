@@ -122,12 +122,12 @@ def exit_missing_nodes(nodes_not_found):
     mul = len(nodes_not_found) > 1  # multiple packages missing ?
     sys.exit(
         f'The package{"s" if mul else ""} '
-        f''''{"', '".join([str(p) for p in nodes_not_found])}' '''
+        f''''{"', '".join(map(str, nodes_not_found))}' '''
         f'{"were" if mul else "was"} requested, '
         f'but {"they are" if mul else "it is"} not available.'
         f'\n'
         f'Update the project file or supply the missing package{"s" if mul else ""} '
-        f''''{"', '".join([p.name for p in nodes_not_found])}' '''
+        f''''{"', '".join(p.name for p in nodes_not_found)}' '''
         f'on the command line with the "-n" switch.')
 
 
@@ -2,14 +2,14 @@ from __future__ import annotations
 import os
 import sys
 
-from .packages import nodes_package
-from . import utils
-from .config import Config
-from .args_parser import process_args
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
+    from .config import Config
     from ..gui.main_window import MainWindow
 
+# application fonts only need to be registered once per process
+_FONTS_LOADED = False
+
 def run(*args_,
         qt_app=None, gui_parent=None, use_sysargs=True,
         **kwargs) -> None | MainWindow:
@@ -66,6 +66,11 @@ def run(*args_,
     -------
     None|Main Window
     """
+    # Deferred, so that importing this module doesn't pull in the node machinery
+    from .packages import nodes_package
+    from . import utils
+    from .args_parser import process_args
+
     # Process command line and method's arguments
     conf: Config = process_args(use_sysargs, *args_, **kwargs)
 
@@ -73,11 +78,11 @@ def run(*args_,
     # Qt application setup
     #
     # Init environment
-    os.environ['COGNIX_MODE'] = 'gui'
-    os.environ['QT_API'] = conf.qt_api
-    from ..node_env import init_node_env
-    init_node_env()
-    
+    os.environ.update({
+        'COGNIX_MODE': 'gui',
+        'QT_API': conf.qt_api,
+    })
+
     # Import GUI sources (must come after setting `os.environ['QT_API']`)
     from ...qtcore.console import Console
     from ..gui.main_window import MainWindow
@@ -85,26 +90,30 @@ def run(*args_,
     # Init Qt application
     if qt_app is None:
         from qtpy.QtWidgets import QApplication
-        if conf.window_geometry:
-            # Pass '--geometry' argument to Qt
-            qt_args = [sys.argv[0], '-geometry', conf.window_geometry]
-        else:
-            qt_args = [sys.argv[0]]
-        
         # TODO figure out what's creating the instance
-        app = QApplication.instance() or QApplication(qt_args)
+        app = QApplication.instance()
+        if app is None:
+            qt_args = [sys.argv[0]]
+            if conf.window_geometry:
+                # Pass '--geometry' argument to Qt
+                qt_args += ['-geometry', conf.window_geometry]
+            app = QApplication(qt_args)
     else:
         app = qt_app
 
     # Register fonts
-    from qtpy.QtGui import QFontDatabase
-    db = QFontDatabase()
-    db.addApplicationFont(
-        utils.abs_path_from_package_dir('resources/fonts/poppins/Poppins-Medium.ttf'))
-    db.addApplicationFont(
-        utils.abs_path_from_package_dir('resources/fonts/source_code_pro/SourceCodePro-Regular.ttf'))
-    db.addApplicationFont(
-        utils.abs_path_from_package_dir('resources/fonts/asap/Asap-Regular.ttf'))
+    global _FONTS_LOADED
+    if not _FONTS_LOADED:
+        from qtpy.QtGui import QFontDatabase
+        db = QFontDatabase()
+        fonts_dir = utils.abs_path_from_package_dir('resources/fonts')
+        for font in (
+            'poppins/Poppins-Medium.ttf',
+            'source_code_pro/SourceCodePro-Regular.ttf',
+            'asap/Asap-Regular.ttf',
+        ):
+            db.addApplicationFont(os.path.join(fonts_dir, font))
+        _FONTS_LOADED = True
 
     #
     # Editor configuration
@@ -123,12 +132,17 @@ def run(*args_,
         if sw.exec() <= 0:
             sys.exit('Start-up screen dismissed')
 
+    # Init the nodes environment only if nodes are going to be loaded
+    if conf.nodes or conf.project:
+        from ..node_env import init_node_env
+        init_node_env()
+
     # Replace node directories with `NodePackage` instances
     if conf.nodes:
         conf.nodes, pkgs_not_found, _ = nodes_package.process_nodes_packages(list(conf.nodes))
         if pkgs_not_found:
             sys.exit(
-                f'Error: Nodes packages not found: {", ".join([str(p) for p in pkgs_not_found])}')
+                f'Error: Nodes packages not found: {", ".join(map(str, pkgs_not_found))}')
 
         # editor_config['requested packages'] = conf.nodes
 
@@ -145,17 +159,17 @@ def run(*args_,
     #   not a list of `str` anymore).
 
     # Get packages required by the project
-    built_in = MainWindow.built_in_packages()
     if conf.project:
         pkgs, pkgs_not_found, project_dict = nodes_package.process_nodes_packages(
             conf.project, requested_packages=list(conf.nodes))
 
         # TODO do this more elegantly somewhere else
+        built_in = frozenset(MainWindow.built_in_packages())
         pkgs = {pkg for pkg in pkgs if pkg.name not in built_in}
         pkgs_not_found = {pkg for pkg in pkgs_not_found if pkg.name not in built_in}
         
         if pkgs_not_found:
-            str_missing_pkgs = ', '.join([str(p.name) for p in pkgs_not_found])
+            str_missing_pkgs = ', '.join(str(p.name) for p in pkgs_not_found)
             plural = len(pkgs_not_found) > 1
             sys.exit(
                 f'The package{"s" if plural else ""} {str_missing_pkgs} '
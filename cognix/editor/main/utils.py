@@ -9,6 +9,7 @@ from os.path import normpath, join, dirname, abspath, expanduser
 import pathlib
 import importlib
 import importlib.util
+from functools import lru_cache
 from typing import Union, Optional, Tuple
 from packaging.version import Version
 
@@ -233,6 +234,7 @@ def dir_path() -> str:
     return abspath(normpath(join(expanduser('~'), '.cognix/')))
 
 
+@lru_cache(maxsize=256)
 def abs_path_from_package_dir(rel_path: str):
     """
     :param rel_path: path relative to package folder (e.g. main/node_env.py)
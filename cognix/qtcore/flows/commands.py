@@ -16,19 +16,43 @@ from cognixcore import (
 )
 
 import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .view import FlowView
 
+# prevents recursive calls of redo() and undo()
+_any_cmd_active: ContextVar[bool] = ContextVar('flow_cmd_active', default=False)
+
+
+class _RecursiveCommandError(RuntimeError):
+    pass
+
+
+@contextmanager
+def _active_guard(action: str):
+    """Marks a FlowUndoCommand as active for the duration of the block"""
+    if _any_cmd_active.get():
+        raise _RecursiveCommandError(
+            f'FlowUndoCommand.{action}() called while another FlowUndoCommand is active, '
+            f'most likely due to a recursive {action}. This is not allowed. '
+            'The editor is now in an undefined state. Save your work and restart the editor. '
+        )
+    token = _any_cmd_active.set(True)
+    try:
+        yield
+    finally:
+        _any_cmd_active.reset(token)
+
+
 def undo_text_multi(items:list, command: str, to_str=None):
     """Generates a text for an undo command that has zero, one or multiple items"""
     
-    if to_str is None:
-        to_str = str
-    
     if len(items) == 1:
-        return f'{command} {to_str(items[0]) if to_str else items[0]}'
+        item = items[0]
+        return f'{command} {item if to_str is None else to_str(item)}'
     elif len(items) == 0:
         return f'Clear-{command}'
     else:
@@ -42,9 +66,6 @@ class FlowUndoCommand(QObject, QUndoCommand):
     undo stack before the parent command, it is here blocked at first.
     """
 
-    # prevent recursive calls of redo() and undo()
-    _any_cmd_active = False
-
     def __init__(self, flow_view: FlowView):
         self.flow_view = flow_view
         self.flow: Flow = flow_view.flow
@@ -61,29 +82,18 @@ class FlowUndoCommand(QObject, QUndoCommand):
     def redo(self) -> None:
         if not self._activated:
             return
-        elif FlowUndoCommand._any_cmd_active:
-            InfoMsgs.write_err(
-                'FlowUndoCommand.redo() called while another FlowUndoCommand is active, '
-                'most likely due to a recursive redo. This is not allowed. '
-                'The editor is now in an undefined state. Save your work and restart the editor. '
-            )
-            return
-        else:
-            FlowUndoCommand._any_cmd_active = True
-            self.redo_()
-            FlowUndoCommand._any_cmd_active = False
+        try:
+            with _active_guard('redo'):
+                self.redo_()
+        except _RecursiveCommandError as e:
+            InfoMsgs.write_err(str(e))
 
     def undo(self) -> None:
-        if FlowUndoCommand._any_cmd_active:
-            InfoMsgs.write_err(
-                'FlowUndoCommand.undo() called while another FlowUndoCommand is active, '
-                'most likely due to a recursive undo. This is not allowed. '
-                'The editor is now in an undefined state. Save your work and restart the editor. '
-            )
-            return
-        FlowUndoCommand._any_cmd_active = True
-        self.undo_()
-        FlowUndoCommand._any_cmd_active = False
+        try:
+            with _active_guard('undo'):
+                self.undo_()
+        except _RecursiveCommandError as e:
+            InfoMsgs.write_err(str(e))
 
     def redo_(self):
         """subclassed"""
@@ -118,35 +128,38 @@ class MoveComponentsCommand(FlowUndoCommand):
         self.items_list = items_list
         self.p_from = p_from
         self.p_to = p_to
-        self.last_item_group_pos = p_to
+        self.dx = p_to.x() - p_from.x()
+        self.dy = p_to.y() - p_from.y()
+        # the items have already been moved when the command is pushed
+        self._moved = True
         self.setText(undo_text_multi(self.items_list, 'Move'))
 
     def undo_(self):
-        items_group = self.items_group()
-        items_group.setPos(self.p_from)
-        self.last_item_group_pos = items_group.pos()
-        self.destroy_items_group(items_group)
-        for item in self.items_list:
-            item.on_move()
+        self.move_items(-self.dx, -self.dy)
+        self._moved = False
 
     def redo_(self):
-        items_group = self.items_group()
-        items_group.setPos(self.p_to - self.last_item_group_pos)
-        self.destroy_items_group(items_group)
-        for item in self.items_list:
-            item.on_move()
-        
-    def items_group(self):
-        return self.flow_view.scene().createItemGroup(self.items_list)
+        if self._moved:
+            return
+        self.move_items(self.dx, self.dy)
+        self._moved = True
 
-    def destroy_items_group(self, items_group):
-        self.flow_view.scene().destroyItemGroup(items_group)
+    def move_items(self, dx: float, dy: float):
+        from ..nodes.item import NodeItem
+        from .connections import ConnectionItem
+        
+        for item in self.items_list:
+            # selected connections are positioned by the pins of their nodes
+            if isinstance(item, ConnectionItem):
+                continue
+            item.moveBy(dx, dy)
+            # node items already update their connections in itemChange()
+            if not isinstance(item, NodeItem):
+                item.on_move()
 
 
 class PlaceNodeCommand(FlowUndoCommand):
     
-    node_placed = Signal(Node)
-    
     def __init__(self, flow_view: FlowView, node_class, pos):
         super().__init__(flow_view)
 
@@ -154,10 +167,6 @@ class PlaceNodeCommand(FlowUndoCommand):
         self.node = None
         self.item_pos = pos
         self._prev_selected = flow_view._current_selected
-        
-        def on_node_placed(node: Node):
-            self.setText(f'Create {node.gui.item}')
-        self.node_placed.connect(on_node_placed)
 
     def undo_(self):
         self.flow.remove_node(self.node)
@@ -169,7 +178,7 @@ class PlaceNodeCommand(FlowUndoCommand):
                 self.flow.add_node(self.node)
             else:
                 self.node = self.flow.create_node(self.node_class)
-            self.node_placed.emit(self.node)
+            self.setText(f'Create {self.node.gui.item}')
         except Exception as e:
             traceback.print_exc()
             raise e
@@ -234,40 +243,44 @@ class RemoveComponentsCommand(FlowUndoCommand):
         self.nodes: list[Node] = []
         self.drawings: list[DrawingObject] = []
         
+        conn_items: list[ConnectionItem] = []
+        
         for i in self.items:
             if isinstance(i, NodeItem):
                 self.node_items.append(i)
                 self.nodes.append(i.node)
-                
+            elif isinstance(i, ConnectionItem):
+                conn_items.append(i)
             elif isinstance(i, DrawingObject):
                 self.drawings.append(i)
 
         # for connections
         f = self.flow
+        nodes_set = frozenset(self.nodes)
+        conn_info = f.connection_info
+        connected_output = f.connected_output
+        connected_inputs = f.connected_inputs
+        add_broken = self.broken_connections.add
+        add_internal = self.internal_connections.add
         
-        for i in self.items:
-            if not isinstance(i, ConnectionItem):
-                continue
-            out_port = i.connection.out_port
-            if out_port.node not in self.nodes:
-                self.broken_connections.add(i.connection)
+        for i in conn_items:
+            out_node = i.connection.out_port.node
+            if out_node not in nodes_set:
+                add_broken(i.connection)
 
         for n in self.nodes:
+            # internal connections are found from the output side only,
+            # the inputs only need to be checked for incoming connections
             for i in n._inputs:
-                cp = n.flow.connected_output(i)
-                if cp is not None:
-                    cn = cp.node
-                    if cn not in self.nodes:
-                        self.broken_connections.add(f.connection_info((cp, i)))
-                    else:
-                        self.internal_connections.add(f.connection_info((cp, i)))
+                cp = connected_output(i)
+                if cp is not None and cp.node not in nodes_set:
+                    add_broken(conn_info((cp, i)))
             for o in n._outputs:
-                for cp in n.flow.connected_inputs(o):
-                    cn = cp.node
-                    if cn not in self.nodes:
-                        self.broken_connections.add(f.connection_info((o, cp)))
+                for cp in connected_inputs(o):
+                    if cp.node not in nodes_set:
+                        add_broken(conn_info((o, cp)))
                     else:
-                        self.internal_connections.add(f.connection_info((o, cp)))
+                        add_internal(conn_info((o, cp)))
 
     def undo_(self):
         # add nodes
@@ -333,12 +346,9 @@ class ConnectPortsCommand(FlowUndoCommand):
         self.connection = None
         self.connecting = True
         
-        for i in flow_view.flow.connected_inputs(out):
-            if i == self.inp:
-                self.connection = (out, i)
-                self.connection_info = self.flow.connection_info(self.connection)
-                self.connecting = False
-                break
+        if inp in self.flow.connected_inputs(out):
+            self.connection = (out, inp)
+            self.connecting = False
 
     def undo_(self):
         if self.connecting:
@@ -384,12 +394,13 @@ class PasteCommand(FlowUndoCommand):
     def modify_data_positions(self, offset):
         """adds the offset to the components' positions in data"""
 
+        ox, oy = offset.x(), offset.y()
         for node in self.data['nodes']:
-            node['pos x'] = node['pos x'] + offset.x()
-            node['pos y'] = node['pos y'] + offset.y()
+            node['pos x'] += ox
+            node['pos y'] += oy
         for drawing in self.data['drawings']:
-            drawing['pos x'] = drawing['pos x'] + offset.x()
-            drawing['pos y'] = drawing['pos y'] + offset.y()
+            drawing['pos x'] += ox
+            drawing['pos y'] += oy
 
     def redo_(self):
         if (not self.nodes and
@@ -397,18 +408,27 @@ class PasteCommand(FlowUndoCommand):
             not self.drawings):
 
             # create components
-            self.create_drawings()
-
-            self.nodes, self.connections = self.flow.load_components(
-                nodes_data=self.data['nodes'],
-                conns_data=self.data['connections']
-            )
+            try:
+                self.create_drawings()
+
+                self.nodes, self.connections = self.flow.load_components(
+                    nodes_data=self.data['nodes'],
+                    conns_data=self.data['connections']
+                )
+            except Exception:
+                # roll back the drawings so undo and a later redo stay consistent
+                for d in self.drawings:
+                    self.flow_view.remove_drawing(d)
+                self.drawings.clear()
+                raise
 
             self.add_new_signal.emit()
         else:
             self.add_existing_signal.emit()
 
     def undo_(self):
+        if not (self.nodes or self.connections or self.drawings):
+            return
         # remove components and their items from flow
         for c in self.connections:
             self.flow.remove_connection(c)
@@ -419,12 +439,15 @@ class PasteCommand(FlowUndoCommand):
 
     def add_existing_components(self):
         # add existing components and items to flow
+        add_node = self.flow.add_node
+        add_connection = self.flow.add_connection
+        add_drawing = self.flow_view.add_drawing
         for n in self.nodes:
-            self.flow.add_node(n)
+            add_node(n)
         for c in self.connections:
-            self.flow.add_connection(c)
+            add_connection(c)
         for d in self.drawings:
-            self.flow_view.add_drawing(d)
+            add_drawing(d)
 
         self.select_new_components_in_view()
 
@@ -432,9 +455,9 @@ class PasteCommand(FlowUndoCommand):
         self.flow_view.clear_selection()
         for d in self.drawings:
             d.setSelected(True)
+        node_items = self.flow_view.node_items
         for n in self.nodes:
-            node_item = self.flow_view.node_items[n]
-            node_item.setSelected(True)
+            node_items[n].setSelected(True)
 
     def create_drawings(self):
         for d in self.data['drawings']:
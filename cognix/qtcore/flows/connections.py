@@ -139,8 +139,8 @@ class ConnectionItem(GUIBase, QGraphicsPathItem, QObject):
         self.setPos(self.out_pos())
 
         # path
-        p1 = QPointF(self.out_item.pin.width_no_padding() * 0.5, 0)
-        p2 = self.inp_pos() - self.scenePos() - QPointF(self.inp_item.pin.width_no_padding() * 0.5, 0)
+        p1 = QPointF(self.out_item.pin_width_no_padding() * 0.5, 0)
+        p2 = self.inp_pos() - self.scenePos() - QPointF(self.inp_item.pin_width_no_padding() * 0.5, 0)
         self.setPath(self.connection_path(p1, p2))
 
         # pen
@@ -193,12 +193,12 @@ class ConnectionItem(GUIBase, QGraphicsPathItem, QObject):
     def out_pos(self) -> QPointF:
         """The current global scene position of the pin of the output port"""
 
-        return self.out_item.pin.get_scene_center_pos()
+        return self.out_item.pin_scene_center_pos()
 
     def inp_pos(self) -> QPointF:
         """The current global scene position of the pin of the input port"""
 
-        return self.inp_item.pin.get_scene_center_pos()
+        return self.inp_item.pin_scene_center_pos()
 
     def itemChange(self, change, value):
         # for highlights
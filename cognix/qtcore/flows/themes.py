@@ -111,6 +111,9 @@ NodeWidget {
     pin_style_data = DataPinStyle()
     pin_style_exec = ExecPinStyle()
     
+    # Setting for port labels
+    pin_label_font = QFont("Source Code Pro", 10, QFont.Bold)
+    
     # Setting for title label
     title_label_styles: dict[str, TextStyle] = {
         'normal': TextStyle(),
@@ -165,7 +168,7 @@ NodeWidget {
             label_str,
             TextStyle(
                 QColor('#FFFFFF') if type_ == 'exec' else node_color,
-                QFont("Source Code Pro", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
 
@@ -388,7 +391,7 @@ class FlowTheme_Toy(FlowTheme):
             label_str,
             TextStyle(
                 QColor('#FFFFFF'),
-                QFont("Source Code Pro", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
         
@@ -806,6 +809,7 @@ class FlowTheme_Simple(FlowTheme):
         margin_cut=2,
         valid_color=QColor('#dddddd')
     )
+    pin_label_font = QFont("Courier New", 10, QFont.Bold)
     
     EXPORT = [
         'nodes background color',
@@ -857,7 +861,7 @@ class FlowTheme_Simple(FlowTheme):
             label_str,
             TextStyle(
                 c,
-                QFont("Courier New", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
         
@@ -922,6 +926,7 @@ class FlowTheme_Ueli(FlowTheme):
         pen_width=0,
         valid_color=QColor('#dddddd')
     )
+    pin_label_font = QFont("Courier New", 10, QFont.Bold)
     
     EXPORT = [
         'nodes background color',
@@ -974,7 +979,7 @@ class FlowTheme_Ueli(FlowTheme):
             label_str,
             TextStyle(
                 c,
-                QFont("Courier New", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
 
@@ -1036,6 +1041,7 @@ class FlowTheme_PureDark(FlowTheme):
     node_small_bg_col = QColor('#363c41')
     node_title_color = QColor('#ffffff')
     port_pin_pen_color = QColor('#ffffff')
+    pin_label_font = QFont("Segoe UI", 10, QFont.Bold)
     
     EXPORT = [
         'extended node background color',
@@ -1083,7 +1089,7 @@ class FlowTheme_PureDark(FlowTheme):
             label_str,
             TextStyle(
                 c,
-                QFont("Segoe UI", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
 
@@ -1192,6 +1198,7 @@ class FlowTheme_Colorful(FlowTheme):
     node_small_background_color = QColor('#363c41')
     node_title_color = QColor('#ffffff')
     port_pin_pen_color = QColor('#ffffff')
+    pin_label_font = QFont("Segoe UI", 10, QFont.Bold)
 
     EXPORT = [
         'node title color',
@@ -1233,7 +1240,7 @@ class FlowTheme_Colorful(FlowTheme):
             label_str,
             TextStyle(
                 c,
-                QFont("Segoe UI", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
 
@@ -1305,7 +1312,7 @@ class FlowTheme_ColorfulLight(FlowTheme_Colorful):
             label_str,
             TextStyle(
                 c,
-                QFont("Segoe UI", 10, QFont.Bold)
+                self.pin_label_font
             )
         )
 
@@ -1354,6 +1361,8 @@ class FlowTheme_Industrial(FlowTheme):
     node_color = QColor(10, 10, 10, 250)
     node_item_shadow_color = QColor(0, 0, 0)
 
+    pin_label_font = QFont("Segoe UI", 8, QFont.Normal)
+
     def setup_NI_title_label(self, text_graphic: GraphicsTextWidget, selected: bool, hovering: bool, node_style: str, 
                              node_title: str, node_color: QColor):
         
@@ -1378,7 +1387,7 @@ class FlowTheme_Industrial(FlowTheme):
             label_str,
             TextStyle(
                 QColor('#FFFFFF'),
-                QFont("Segoe UI", 8, QFont.Normal)
+                self.pin_label_font
             )
         )
 
@@ -1490,6 +1499,7 @@ class FlowTheme_Fusion(FlowTheme):
     node_small_bg_col = QColor('#cccdcf')
     node_title_color = QColor('#1f1f1f')
     port_pin_pen_color = QColor('#1f1f1f')
+    pin_label_font = QFont("Segoe UI", 8)
 
     node_item_shadow_color = QColor('#cccccc')
 
@@ -1511,7 +1521,7 @@ class FlowTheme_Fusion(FlowTheme):
             label_str,
             TextStyle(
                 QColor(0, 0, 0),
-                QFont("Segoe UI", 8)
+                self.pin_label_font
             )
         )
         
@@ -1520,7 +1530,7 @@ class FlowTheme_Fusion(FlowTheme):
         pen.setWidthF(1.2)
         painter.setPen(pen)
 
-        self.paint_PI_label_default(painter, label_str, QColor(0, 0, 0), QFont("Segoe UI", 8), bounding_rect)
+        self.paint_PI_label_default(painter, label_str, QColor(0, 0, 0), self.pin_label_font, bounding_rect)
 
 
     def paint_PI(self, node_gui, painter, option, node_color, type_, pin_state, rect):
@@ -743,7 +743,9 @@ class FlowView(GUIBase, QGraphicsView):
                             self._get_drag_conn_pair()
                         )
                         if  self._valid_check == ConnValidType.VALID:
-                            potential_conn_pin = inp_port_item.pin
+                            # a collapsed node doesn't show its pins
+                            if not node_item_over.collapsed:
+                                potential_conn_pin = inp_port_item.pin
                             break
                 else:
                     for out_port_item in node_item_over.outputs:
@@ -752,7 +754,9 @@ class FlowView(GUIBase, QGraphicsView):
                             self._get_drag_conn_pair()
                         )
                         if self._valid_check == ConnValidType.VALID:
-                            potential_conn_pin = out_port_item.pin
+                            # a collapsed node doesn't show its pins
+                            if not node_item_over.collapsed:
+                                potential_conn_pin = out_port_item.pin
                             break
             
             # If port has changed
@@ -1488,6 +1492,14 @@ class FlowView(GUIBase, QGraphicsView):
         if c in self.connection_items:
             self.connection_items[c].changed = True
             self.connection_items[c].update()
+    
+    def set_connections_highlighted(self, conns: Iterable[ConnectionInfo], highlighted: bool):
+        """Sets the highlight of the items of multiple connections"""
+        items = self.connection_items
+        for c in conns:
+            item = items.get(c)
+            if item is not None:
+                item.set_highlighted(highlighted)
 
     # DRAWINGS
     def create_drawing(self, data=None) -> DrawingObject:
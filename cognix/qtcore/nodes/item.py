@@ -648,12 +648,16 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
                     print('Exception while setting data in', self.node.title, 'Node\'s main widget:', e,
                           ' (was this intended?)')
 
+        # ports of collapsed nodes don't need their pins and labels yet
+        if self.init_data is not None and self.init_data.get('collapsed'):
+            self.collapsed = True
+
         # catch up on init ports
-        for inp in self.node._inputs:
-            self.add_new_input(inp)
+        for i, inp in enumerate(self.node._inputs):
+            self.add_new_input(inp, i)
 
-        for out in self.node._outputs:
-            self.add_new_output(out)
+        for i, out in enumerate(self.node._outputs):
+            self.add_new_output(out, i)
 
         if self.init_data is not None:
             if self.init_data.get('unconnected ports hidden'):
@@ -755,9 +759,9 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
 
     def on_node_input_added(self, index, inp: NodeInput):
         insert = index if index == len(self.node._inputs) - 1 else None
-        self.add_new_input(inp, insert)
+        self.add_new_input(inp, index, insert)
 
-    def add_new_input(self, inp: NodeInput, insert: int = None):
+    def add_new_input(self, inp: NodeInput, index: int, insert: int = None):
 
         if inp in self.node_gui.input_widgets:
             widget_name = self.node_gui.input_widgets[inp]['name']
@@ -768,7 +772,7 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
             widget = None
 
         # create item
-        item = InputPortItem(self.node_gui, self, inp, input_widget=widget)
+        item = InputPortItem(self.node_gui, self, inp, index, input_widget=widget)
 
         if insert is not None:
             self.inputs.insert(insert, item)
@@ -777,6 +781,11 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
             self.inputs.append(item)
             self.widget.add_input_to_layout(item)
 
+        # the following items' ports have been shifted
+        for inp_item in self.inputs:
+            if inp_item is not item:
+                inp_item.port_list_changed(index, inserted=True)
+
         if not self.initializing:
             self.update_shape()
             self.update()
@@ -785,6 +794,7 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
         self.remove_input(index, inp)
 
     def on_node_input_renamed(self, index: int, inp: NodeInput, old_name: str):
+        self.inputs[index].mark_label_dirty()
         self.inputs[index].update()
         self.update()
         
@@ -793,12 +803,12 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
         
         # for some reason, I have to remove all widget items manually from the scene too. setting the items to
         # ownedByLayout(True) does not work, I don't know why.
-        self.scene().removeItem(item.pin)
-        self.scene().removeItem(item.label)
-        if item.proxy is not None:
-            self.scene().removeItem(item.proxy)
+        item.remove_from_scene(self.scene())
 
         self.inputs.remove(item)
+        item.port_list_changed(index, inserted=False)
+        for inp_item in self.inputs:
+            inp_item.port_list_changed(index, inserted=False)
         self.widget.remove_input_from_layout(item)
 
         if not self.initializing:
@@ -807,13 +817,13 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
 
     def on_node_output_added(self, index, out: NodeOutput):
         insert = index if index == len(self.node._outputs) - 1 else None
-        self.add_new_output(out, insert)
+        self.add_new_output(out, index, insert)
 
-    def add_new_output(self, out: NodeOutput, insert: int = None):
+    def add_new_output(self, out: NodeOutput, index: int, insert: int = None):
 
         # create item
         # out.item = OutputPortItem(out.node, self, out)
-        item = OutputPortItem(self.node_gui, self, out)
+        item = OutputPortItem(self.node_gui, self, out, index)
 
         if insert is not None:
             self.outputs.insert(insert, item)
@@ -822,6 +832,11 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
             self.outputs.append(item)
             self.widget.add_output_to_layout(item)
 
+        # the following items' ports have been shifted
+        for out_item in self.outputs:
+            if out_item is not item:
+                out_item.port_list_changed(index, inserted=True)
+
         if not self.initializing:
             self.update_shape()
             self.update()
@@ -830,6 +845,7 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
         self.remove_output(index, out)
     
     def on_node_output_renamed(self, index: int, out: NodeOutput, old_name: str):
+        self.outputs[index].mark_label_dirty()
         self.outputs[index].update()
         self.update_shape()
 
@@ -837,10 +853,12 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
         item = self.outputs[index]
         
         # see remove_input() for info!
-        self.scene().removeItem(item.pin)
-        self.scene().removeItem(item.label)
+        item.remove_from_scene(self.scene())
 
         self.outputs.remove(item)
+        item.port_list_changed(index, inserted=False)
+        for out_item in self.outputs:
+            out_item.port_list_changed(index, inserted=False)
         self.widget.remove_output_from_layout(item)
 
         if not self.initializing:
@@ -875,6 +893,9 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
             self.setGraphicsEffect(self.shadow_effect)
         else:
             self.setGraphicsEffect(None)
+        
+        for port_item in self.inputs + self.outputs:
+            port_item.design_changed()
 
         self.widget.update_shape()
         self.animator.reload_values()
@@ -920,6 +941,8 @@ class NodeItem(GUIBase, QGraphicsObject):  # QGraphicsItem, QObject):
 
     def expand(self):
         self.collapsed = False
+        for port_item in self.inputs + self.outputs:
+            port_item.ensure_ui()
         self.widget.expand()
         self.update_shape()
 
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-from qtpy.QtWidgets import QGraphicsGridLayout, QGraphicsWidget, QGraphicsLayoutItem
+from qtpy.QtWidgets import QGraphicsGridLayout, QGraphicsWidget, QGraphicsLayoutItem, QGraphicsItem
 from qtpy.QtCore import Qt, QRectF, QPointF, QSizeF
-from qtpy.QtGui import QFont
 
 from ..gui_base import GUIBase
 from ..utils import shorten, create_tooltip
@@ -14,7 +13,7 @@ from enum import IntEnum
 from cognixcore import (
     NodePort,
     NodeInput,
-    NodeOutput,
+    ConnectionInfo,
     serialize,
     deserialize,
 )
@@ -24,20 +23,25 @@ if TYPE_CHECKING:
     from ..nodes.gui import NodeGUI
     from ..nodes.item import NodeItem
     from ..flows.view import FlowView
+
+# the pin states as plain ints, used internally instead of PinState
+PIN_DISCONNECTED, PIN_CONNECTED, PIN_VALID, PIN_INVALID = 1, 2, 3, 4
     
 # utils
+# these take the port item, which already knows the direction of its port
 
 
-def is_connected(port: NodePort):
-    if isinstance(port, NodeOutput):
-        is_connected = len(port.node.flow.connected_inputs(port)) > 0
+def is_connected(port_item: PortItem):
+    port = port_item.port
+    if port_item._is_input:
+        return port.node.flow.connected_output(port) is not None
     else:
-        is_connected = port.node.flow.connected_output(port) is not None
-    return is_connected
+        return len(port.node.flow.connected_inputs(port)) > 0
 
 
-def val(port: NodePort):
-    if isinstance(port, NodeOutput):
+def val(port_item: PortItem):
+    port = port_item.port
+    if not port_item._is_input:
         return port.val
     else:
         conn_out = port.node.flow.connected_output(port)
@@ -47,23 +51,16 @@ def val(port: NodePort):
             return None
 
 
-def connections(port: NodePort):
+def connections(port_item: PortItem):
+    port = port_item.port
     f = port.node.flow
-    if isinstance(port, NodeOutput):
-        return [
-            f.connection_info((port, i)) 
-            for i in port.node.flow.connected_inputs(port)
-        ]
+    if not port_item._is_input:
+        for i in f.connected_inputs(port):
+            yield f.connection_info((port, i))
     else:
-        conn_out = port.node.flow.connected_output(port)
+        conn_out = f.connected_output(port)
         if conn_out:
-            return [
-                f.connection_info(
-                    (port.node.flow.connected_output(port), port)
-                )
-            ]
-        else:
-            return []
+            yield f.connection_info((conn_out, port))
 
 
 # main classes
@@ -77,6 +74,7 @@ class PortItem(GUIBase, QGraphicsWidget):
         node_gui: NodeGUI, 
         node_item: NodeItem, 
         port: NodePort, 
+        port_index: int,
         flow_view: FlowView
     ):
         GUIBase.__init__(self, representing_component=port)
@@ -88,69 +86,216 @@ class PortItem(GUIBase, QGraphicsWidget):
         self.node = self.node_gui.node
         self.node_item = node_item
         self._is_input = isinstance(port, NodeInput)
-        self._port_list = self.node._inputs if self._is_input else self.node._outputs
-        self._port_index = self._port_list.index(port)
+        self._port_index = port_index
+        self.port = port
         self.flow_view = flow_view
 
-        self.pin = PortItemPin(
-            self._port_list,
-            self._port_index,
-            self,
-            self.node_gui, 
-            self.node_item
-        )
-
-        self.label = GraphicsTextWidget(self)
-        self.label.set_font(QFont("Source Code Pro", 10, QFont.Bold))
+        # the pin and label are created on first access, see setup_ui()
+        self._pin: PortItemPin = None
+        self._label: GraphicsTextWidget = None
+        self._ui_ready = False
+        self._last_geom: QRectF = None
+        # set when the theme needs to set up the label again, see update()
+        self._label_dirty = True
         
-        self._layout = QGraphicsGridLayout()
-        self._layout.setSpacing(0)
-        self._layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(self._layout)
+        # only created if the port needs more than a single row of pin and
+        # label, otherwise those are positioned in setGeometry()
+        self._layout: QGraphicsGridLayout = None
 
+    def port_list_changed(self, index: int, inserted: bool):
+        """
+        Keeps the port index valid after a port was inserted into or
+        removed from the node's ports at the given index.
+        """
+        if inserted:
+            if index > self._port_index:
+                return
+            self._port_index += 1
+        elif index == self._port_index:
+            self.port = None
+        elif index < self._port_index:
+            self._port_index -= 1
+        else:
+            return
+        if self._pin is not None:
+            self._pin._set_port(self.port)
+    
+    def mark_label_dirty(self):
+        """Makes the next update() set up the label again"""
+        self._label_dirty = True
+    
+    def design_changed(self):
+        """Called by the node item when the flow theme changed"""
+        self._label_dirty = True
+        if self._pin is not None:
+            self._pin.design_changed()
+    
+    def remove_from_scene(self, scene):
+        """
+        Removes the child items from the scene. Setting them to be owned
+        by the layout doesn't do that.
+        """
+        if self._pin is not None:
+            scene.removeItem(self._pin)
+        if self._label is not None:
+            scene.removeItem(self._label)
+    
     @property
-    def port(self):
-        if len(self._port_list) <= self._port_index:
-            return None
-        return self._port_list[self._port_index]
+    def pin(self) -> PortItemPin:
+        if self._pin is None:
+            self._create_pin()
+        return self._pin
+    
+    @property
+    def label(self) -> GraphicsTextWidget:
+        if self._label is None:
+            self._label = GraphicsTextWidget(self)
+        return self._label
+    
+    def _create_pin(self):
+        self._pin = PortItemPin(self, self.node_gui, self.node_item)
+        # catch up to the connections
+        self._pin.set_state(PIN_DISCONNECTED)
+    
+    def create_pin_and_label(self):
+        """Creates the pin and label, unless they exist already"""
+        if self._pin is None:
+            self._create_pin()
+        if self._label is None:
+            self._label = GraphicsTextWidget(self)
+    
+    def pin_scene_center_pos(self) -> QPointF:
+        """The scene position connections attach to, doesn't create the pin if the node is collapsed"""
+        if self.node_item.collapsed:
+            if self._is_input:
+                return self.node_item.get_left_body_header_vertex_scene_pos()
+            else:
+                return self.node_item.get_right_body_header_vertex_scene_pos()
+        return self.pin.get_scene_center_pos()
+    
+    def pin_width_no_padding(self) -> float:
+        """The width of the pin without padding, doesn't create the pin"""
+        if self._pin is not None:
+            return self._pin.width_no_padding()
+        return PortItemPin.width - 2 * PortItemPin.padding
     
     # >>> interaction boilerplate >>>
     def boundingRect(self):
         return QRectF(QPointF(0, 0), self.geometry().size())
 
     def setGeometry(self, rect):
+        # relayouts often pass the current geometry again
+        if self._last_geom is not None and rect == self._last_geom:
+            return
+        self._last_geom = QRectF(rect)
         self.prepareGeometryChange()
         QGraphicsLayoutItem.setGeometry(self, rect)
         self.setPos(rect.topLeft())
+        if self._layout is None and self._ui_ready:
+            self._place_pin_and_label(rect)
+
+    def sizeHint(self, which, constraint=QSizeF()):
+        if self._layout is not None:
+            return super().sizeHint(which, constraint)
+        if not self._ui_ready:
+            return QSizeF(0, 0)
+        pin = self.pin
+        label_size = self.label.sizeHint(which)
+        return QSizeF(
+            pin.width + label_size.width(), 
+            max(pin.height, label_size.height())
+        )
     # <<< interaction boilerplate <<<
+    
+    def _create_layout(self) -> QGraphicsGridLayout:
+        self._layout = QGraphicsGridLayout()
+        self._layout.setSpacing(0)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self._layout)
+        return self._layout
+    
+    def _place_pin_and_label(self, rect: QRectF):
+        """Lays out the pin and label in one row, the pin on the node's border"""
+        pin = self.pin
+        label = self.label
+        label_size = label.sizeHint(Qt.PreferredSize)
+        w, h = rect.width(), rect.height()
+        pin_y = (h - pin.height) / 2
+        label_y = (h - label_size.height()) / 2
+        
+        if self._is_input:
+            pin.setGeometry(QRectF(0, pin_y, pin.width, pin.height))
+            label.setGeometry(QRectF(pin.width, label_y, label_size.width(), label_size.height()))
+        else:
+            pin.setGeometry(QRectF(w - pin.width, pin_y, pin.width, pin.height))
+            label.setGeometry(QRectF(
+                w - pin.width - label_size.width(), label_y, label_size.width(), label_size.height()
+            ))
+    
+    def _label_updated(self):
+        """Called after the theme set up the label"""
+        if self._layout is None and self._ui_ready:
+            # the size hint depends on the label, and the label might have
+            # changed without this item's geometry changing
+            self._last_geom = None
+            self._place_pin_and_label(self.geometry())
+            self.updateGeometry()
+        QGraphicsWidget.update(self)
 
     def update(self):
-        if self.port is None:
+        if not self._label_dirty:
+            return super().update()
+        if self.port is None or self._label is None:
             return
         self.node_item.session_design.flow_theme.setup_PI_label(
-            self.label,
+            self._label,
             self.port.type_,
             self.pin.state,
             self.port.label_str,
             self.node_gui.color,
         )
-        super().update()
+        self._label_dirty = False
+        self._label_updated()
         
     def setup_ui(self):
         pass
+    
+    def ensure_ui(self):
+        """
+        Sets up the pin, label and layout, unless already done.
+        
+        This is skipped for ports created while the node is collapsed,
+        and done once the node is expanded.
+        """
+        if self._ui_ready:
+            return
+        self._ui_ready = True
+        self.setup_ui()
+        self.update()
 
     def port_connected(self):
-        self.pin.state = PinState.CONNECTED
+        if self._pin is None:
+            # the pin picks up the state when it's created
+            return
+        self._pin._invalidate_connections()
+        # no need to check the connection, it was just made
+        self._pin.set_state(PIN_CONNECTED, protect_connection=False)
+        self.mark_label_dirty()
         self.update()
 
     def port_disconnected(self):
-        self.pin.state = PinState.DISCONNECTED
+        if self._pin is None:
+            return
+        self._pin._invalidate_connections()
+        # an input has only one connection, an output might still have others
+        self._pin.set_state(PIN_DISCONNECTED, protect_connection=not self._is_input)
+        self.mark_label_dirty()
         self.update()
 
 
 class InputPortItem(PortItem):
-    def __init__(self, node_gui: NodeGUI, node_item: NodeItem, port: NodePort, input_widget: tuple[type, str] = None):
-        super().__init__(node_gui, node_item, port, node_gui.flow_view)
+    def __init__(self, node_gui: NodeGUI, node_item: NodeItem, port: NodePort, port_index: int, input_widget: tuple[type, str] = None):
+        super().__init__(node_gui, node_item, port, port_index, node_gui.flow_view)
 
         self.proxy = None  # widget proxy
         self.widget = None  # widget
@@ -179,25 +324,35 @@ class InputPortItem(PortItem):
                 # to prevent loading of the input widget, 'widget data' must be None
                 pass
 
-        self.setup_ui()
+        if not self.node_item.collapsed:
+            self.ensure_ui()
 
     def setup_ui(self):
-        l = self._layout
+        if not self.widget:
+            # pin and label are placed in setGeometry()
+            self.create_pin_and_label()
+            return
+        
+        l = self._create_layout()
 
         # l.setSpacing(0)
         l.addItem(self.pin, 0, 0)
         l.setAlignment(self.pin, Qt.AlignVCenter | Qt.AlignLeft)
         l.addItem(self.label, 0, 1)
         l.setAlignment(self.label, Qt.AlignVCenter | Qt.AlignLeft)
-        if self.widget:
-            if self.widget.position == 'below':
-                l.addItem(self.proxy, 1, 0, 1, 2)
-            elif self.widget.position == 'besides':
-                l.addItem(self.proxy, 0, 2)
-            else:
-                print('Unknown input widget position:', self.widget.position)
+        if self.widget.position == 'below':
+            l.addItem(self.proxy, 1, 0, 1, 2)
+        elif self.widget.position == 'besides':
+            l.addItem(self.proxy, 0, 2)
+        else:
+            print('Unknown input widget position:', self.widget.position)
+
+        l.setAlignment(self.proxy, Qt.AlignCenter)
 
-            l.setAlignment(self.proxy, Qt.AlignCenter)
+    def remove_from_scene(self, scene):
+        super().remove_from_scene(scene)
+        if self.proxy is not None:
+            scene.removeItem(self.proxy)
 
     def create_widget(self, widget_class, widget_pos):
         if widget_class is None:
@@ -211,7 +366,8 @@ class InputPortItem(PortItem):
 
         # custom input widget
         self.widget = widget_class(params)
-        self.proxy = FlowViewProxyWidget(self.flow_view, parent=self.node_item)
+        # parented to this item, so it stays hidden until it's in the layout
+        self.proxy = FlowViewProxyWidget(self.flow_view, parent=self)
         self.proxy.setWidget(self.widget)
 
     def port_connected(self):
@@ -246,66 +402,108 @@ class InputPortItem(PortItem):
 
 
 class OutputPortItem(PortItem):
-    def __init__(self, node_gui: 'NodeGUI', node_item: 'NodeItem', port: NodePort):
-        super().__init__(node_gui, node_item, port, node_gui.flow_view)
+    def __init__(self, node_gui: 'NodeGUI', node_item: 'NodeItem', port: NodePort, port_index: int):
+        super().__init__(node_gui, node_item, port, port_index, node_gui.flow_view)
 
-        self.setup_ui()
+        if not self.node_item.collapsed:
+            self.ensure_ui()
 
     def setup_ui(self):
-        l = self._layout
-
-        # l.setSpacing(5)
-        l.addItem(self.label, 0, 0)
-        l.setAlignment(self.label, Qt.AlignVCenter | Qt.AlignRight)
-        l.addItem(self.pin, 0, 1)
-
-        l.setAlignment(self.pin, Qt.AlignVCenter | Qt.AlignRight)
+        # pin and label are placed in setGeometry()
+        self.create_pin_and_label()
 
 
 # contents
 
 class PinState(IntEnum):
-    DISCONNECTED = 1
-    CONNECTED = 2
-    VALID = 3
-    INVALID = 4
+    DISCONNECTED = PIN_DISCONNECTED
+    CONNECTED = PIN_CONNECTED
+    VALID = PIN_VALID
+    INVALID = PIN_INVALID
+
+# maps the int states back to PinState, indexed by the state
+_PIN_STATES = (None, *PinState)
         
         
 class PortItemPin(QGraphicsWidget):
     
-    def __init__(self, port_list: list[NodePort], port_index: int, port_item, node_gui: NodeGUI, node_item: NodeItem):
-        super(PortItemPin, self).__init__(node_item)
+    # the size of a pin is fixed
+    padding = 2
+    width = 17
+    height = 17
+    
+    def __init__(self, port_item: PortItem, node_gui: NodeGUI, node_item: NodeItem):
+        # a child of the port item, so it's hidden with it while the node is collapsed
+        super(PortItemPin, self).__init__(port_item)
         
-        self._port_list = port_list
-        self.port_index = port_index
+        self.port = port_item.port
         self.port_item = port_item
         self.node_gui = node_gui
         self.node_item = node_item
         self.flow_view = self.node_item.flow_view
         
-        self._state = PinState.DISCONNECTED
+        # read on every paint, refreshed by design_changed()
+        self._theme = node_item.session_design.flow_theme
+        self._node_color = node_gui.color
+        
+        self._state = PIN_DISCONNECTED
 
         self.setGraphicsItem(self)
+        # the pin is only repainted when its state or the theme changes
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
         self.setAcceptHoverEvents(True)
         self.hovered = False
         self.setCursor(Qt.CrossCursor)
         self.tool_tip_pos = None
 
-        self.padding = 2
-        self.width = 17
-        self.height = 17
         self.port_local_pos = None
-
-    @property
-    def port(self):
-        if len(self._port_list) <= self.port_index:
-            return None
-        return self._port_list[self.port_index]
+        # center in local coordinates, kept up to date by setGeometry()
+        self._local_center = QPointF(self.width / 2, self.height / 2)
+        self._last_geom: QRectF = None
+        # the rect handed to the theme on paint, the pin size is fixed
+        self._paint_rect = QRectF(
+            self.padding, 
+            self.padding, 
+            self.width - 2 * self.padding, 
+            self.height - 2 * self.padding
+        )
+        
+        # connection caches, invalidated by the port item on (dis)connect
+        self._conn_cache: list[ConnectionInfo] | None = None
+        self._is_connected_cache: bool | None = None
+
+    def design_changed(self):
+        """Refreshes the cached theme and node color, called by the node item"""
+        self._theme = self.node_item.session_design.flow_theme
+        self._node_color = self.node_gui.color
+        self.update()
+    
+    def _set_port(self, port: NodePort):
+        """Updates the port after the node's ports have changed"""
+        self.port = port
+        self._invalidate_connections()
+    
+    def _invalidate_connections(self):
+        """Clears the cached connections of the port"""
+        self._conn_cache = None
+        self._is_connected_cache = None
+    
+    def connections(self) -> list[ConnectionInfo]:
+        """The connections of the port, cached until the port is (dis)connected"""
+        if self._conn_cache is None:
+            self._conn_cache = list(connections(self.port_item))
+        return self._conn_cache
+    
+    def is_connected(self) -> bool:
+        """Whether the port is connected, cached until the port is (dis)connected"""
+        if self._is_connected_cache is None:
+            self._is_connected_cache = is_connected(self.port_item)
+        return self._is_connected_cache
     
     @property
     def state(self):
         """Returns the pin state, regardless of whether it's connected"""
-        return self._state
+        return _PIN_STATES[self._state]
     
     @state.setter
     def state(self, value: PinState):
@@ -318,20 +516,28 @@ class PortItemPin(QGraphicsWidget):
         
         If protect_connection and port is connected, state is set to PinState.CONNECTED
         """
-        self._state = (
-            value 
-            if not (is_connected(self.port) and protect_connection) 
-            else PinState.CONNECTED
+        state = (
+            int(value) 
+            if not (protect_connection and self.is_connected()) 
+            else PIN_CONNECTED
         )
-        self.update
+        if state != self._state:
+            self._state = state
+            # the theme might style the label by the pin state
+            self.port_item.mark_label_dirty()
+            self.update()
         
     def boundingRect(self):
         return QRectF(QPointF(0, 0), self.geometry().size())
 
     def setGeometry(self, rect):
+        if self._last_geom is not None and rect == self._last_geom:
+            return
+        self._last_geom = QRectF(rect)
         self.prepareGeometryChange()
         QGraphicsLayoutItem.setGeometry(self, rect)
         self.setPos(rect.topLeft())
+        self._local_center = QPointF(rect.width() / 2, rect.height() / 2)
 
     def sizeHint(self, which, constraint=...):
         return QSizeF(self.width, self.height)
@@ -341,16 +547,14 @@ class PortItemPin(QGraphicsWidget):
         if not port:
             return
         
-        self.node_item.session_design.flow_theme.paint_PI(
+        self._theme.paint_PI(
             node_gui=self.node_gui,
             painter=painter,
             option=option,
-            node_color=self.node_gui.color,
+            node_color=self._node_color,
             type_=port.type_,
-            pin_state=self._state,
-            rect=QRectF(
-                self.padding, self.padding, self.width_no_padding(), self.height_no_padding()
-            ),
+            pin_state=_PIN_STATES[self._state],
+            rect=self._paint_rect,
         )
 
     def mousePressEvent(self, event):
@@ -364,12 +568,10 @@ class PortItemPin(QGraphicsWidget):
 
     def hoverEnterEvent(self, event):
         if self.port.type_ == 'data':
-            self.setToolTip(create_tooltip(val(self.port)))
+            self.setToolTip(create_tooltip(val(self.port_item)))
 
         # highlight connections
-        items = self.flow_view.connection_items
-        for c in connections(self.port):
-            items[c].set_highlighted(True)
+        self.flow_view.set_connections_highlighted(self.connections(), True)
 
         self.hovered = True
 
@@ -377,9 +579,7 @@ class PortItemPin(QGraphicsWidget):
 
     def hoverLeaveEvent(self, event):
         # un-highlight connections
-        items = self.flow_view.connection_items
-        for c in connections(self.port):
-            items[c].set_highlighted(False)
+        self.flow_view.set_connections_highlighted(self.connections(), False)
 
         self.hovered = False
 
@@ -387,18 +587,15 @@ class PortItemPin(QGraphicsWidget):
 
     def width_no_padding(self):
         """The width without the padding"""
-        return self.width - 2 * self.padding
+        return self._paint_rect.width()
 
     def height_no_padding(self):
         """The height without the padding"""
-        return self.height - 2 * self.padding
+        return self._paint_rect.height()
 
     def get_scene_center_pos(self):
         if not self.node_item.collapsed:
-            return QPointF(
-                self.scenePos().x() + self.boundingRect().width() / 2,
-                self.scenePos().y() + self.boundingRect().height() / 2,
-            )
+            return self.scenePos() + self._local_center
         else:
             if isinstance(self.port_item, InputPortItem):
                 return self.node_item.get_left_body_header_vertex_scene_pos()